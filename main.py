@@ -4,27 +4,41 @@ import argparse
 import json
 import re
 import logging
+import functools
+import itertools
+import mmap
+from collections import deque
 from concurrent.futures import ThreadPoolExecutor
-import chardet
+try:
+    import orjson  # Optional: encodes the json output format several times faster
+except ImportError:
+    orjson = None
 from colorama import init, Fore, Style
-from tqdm import tqdm
-import markdown2
-import pyperclip
-import git
-import tkinter as tk
-from tkinter import ttk, messagebox
 import datetime
 import gettext
+import html
 import shutil
+import stat
+import sqlite3
+import subprocess
 import sys
+import threading
+import unicodedata
+
+# Resolved once at import instead of on every keypress and screen redraw
+SYSTEM = platform.system()
+IS_WINDOWS = SYSTEM == "Windows"
 
 # Import msvcrt only on Windows
-if platform.system() == "Windows":
+if IS_WINDOWS:
     import msvcrt
 else:
     import tty
     import termios
 
+# Command used to open saved output (None means os.startfile on Windows)
+OPEN_COMMAND = {"Windows": None, "Darwin": ["open"]}.get(SYSTEM, ["xdg-open"])
+
 # Initialize i18n
 lang = os.getenv("LANG", "en")
 
@@ -168,6 +182,48 @@ PROJECT_DEFAULTS = {
     }
 }
 
+# Files larger than this are memory-mapped for the binary sniff and keyword/regex scanning
+MMAP_THRESHOLD = 1 << 20
+
+# Leading bytes inspected to tell text from binary files
+BINARY_SNIFF_BYTES = 8192
+
+# Files handed to a reader thread per task
+READ_BATCH_SIZE = 16
+
+# Processed file blocks from earlier runs, reused while a file's mtime and size are unchanged
+READ_CACHE_PATH = os.path.join("output", ".cache", "read_cache.sqlite3")
+# Bump whenever read_file's output or the cache schema changes; older caches are then discarded
+READ_CACHE_VERSION = 2
+
+# Marker files in a project root that point at each project type
+PROJECT_INDICATOR_FILES = {
+    "python": frozenset({"pyproject.toml", "requirements.txt", "setup.py", "Pipfile", "poetry.lock"}),
+    "nodejs": frozenset({"package.json", "npm-shrinkwrap.json", "yarn.lock", "package-lock.json"}),
+    "java": frozenset({"pom.xml", "build.gradle", "build.gradle.kts"}),
+    "go": frozenset({"go.mod", "go.sum"}),
+    "php": frozenset({"composer.json", "composer.lock"}),
+}
+# C# projects are marked by any *.csproj / *.sln file rather than fixed names
+CSHARP_INDICATOR_EXTS = frozenset({".csproj", ".sln"})
+
+# Source extensions counted toward each project type (dict order breaks score ties)
+PROJECT_SOURCE_EXTENSIONS = {
+    "python": (".py",),
+    "nodejs": (".js", ".ts", ".jsx", ".tsx"),
+    "java": (".java",),
+    "go": (".go",),
+    "csharp": (".cs",),
+    "php": (".php",),
+}
+
+# Folders never worth descending into when guessing the project type: VCS metadata,
+# dependencies and tool caches. Build output (target, bin, obj, dist, ...) still counts.
+DETECT_SKIP_FOLDERS = frozenset({
+    '.git', 'node_modules', '.venv', 'venv', 'vendor', '__pycache__', '.pytest_cache',
+    '.mypy_cache'
+})
+
 PROJECT_COLORS = {
     "python": Fore.MAGENTA,
     "nodejs": Fore.YELLOW,
@@ -190,26 +246,17 @@ def setup_logging(log_file):
         ]
     )
 
+@functools.lru_cache(maxsize=32)
 def validate_path(folder_path):
-    """Validate that the folder path exists and is a directory."""
-    if not os.path.exists(folder_path):
-        raise ValueError(_(f"Path does not exist: {folder_path}"))
-    if not os.path.isdir(folder_path):
-        raise ValueError(_(f"Path is not a directory: {folder_path}"))
-    return os.path.abspath(folder_path)
-
-def get_folder_size(folder_path):
-    """Calculate total size of folder in bytes."""
-    total = 0
+    """Validate that the folder path exists and is a directory (successful results are cached)."""
+    # One stat answers both questions
     try:
-        for dirpath, dirnames, filenames in os.walk(folder_path):
-            for f in filenames:
-                fp = os.path.join(dirpath, f)
-                if os.path.exists(fp):
-                    total += os.path.getsize(fp)
-    except Exception:
-        pass
-    return total
+        st = os.stat(folder_path)
+    except (OSError, ValueError):
+        raise ValueError(_("Path does not exist: %s") % folder_path)
+    if not stat.S_ISDIR(st.st_mode):
+        raise ValueError(_("Path is not a directory: %s") % folder_path)
+    return os.path.abspath(folder_path)
 
 def format_size(bytes_size):
     """Format bytes to human readable format."""
@@ -229,62 +276,47 @@ def get_size_color(bytes_size):
     else:
         return Fore.GREEN
 
+@functools.lru_cache(maxsize=32)
 def detect_project_type_advanced(folder_path):
     """Advanced project type detection based on files and structure."""
     try:
         folder_path = validate_path(folder_path)
         
-        # Count files by extension
+        # One scandir sweep counts extensions; the root listing doubles as the indicator lookup
         file_counts = {}
         total_files = 0
-        
-        for root, dirs, files in os.walk(folder_path):
-            # Skip common exclude folders
-            dirs[:] = [d for d in dirs if d not in ['.git', 'node_modules', '.venv', 'vendor']]
-            
-            for file in files:
-                total_files += 1
-                ext = os.path.splitext(file)[1].lower()
-                file_counts[ext] = file_counts.get(ext, 0) + 1
-        
+        top_items = None
+        stack = [folder_path]
+        while stack:
+            try:
+                with os.scandir(stack.pop()) as it:
+                    entries = list(it)
+            except OSError:
+                continue
+            if top_items is None:
+                top_items = {entry.name for entry in entries}
+            for entry in entries:
+                if entry.is_dir():
+                    # Skip common exclude folders; linked folders are not followed
+                    if entry.name not in DETECT_SKIP_FOLDERS and not entry.is_symlink():
+                        stack.append(entry.path)
+                else:
+                    total_files += 1
+                    ext = _file_ext(entry.name)
+                    file_counts[ext] = file_counts.get(ext, 0) + 1
+
         if total_files == 0:
             return "generic", 0
-        
-        # Check for specific project files first
-        items = os.listdir(folder_path)
-        
-        # Python indicators
-        python_files = [f for f in ["pyproject.toml", "requirements.txt", "setup.py", "Pipfile", "poetry.lock"] if f in items]
-        python_percentage = (file_counts.get('.py', 0) / total_files) * 100
-        
-        # Node.js indicators
-        nodejs_files = [f for f in ["package.json", "npm-shrinkwrap.json", "yarn.lock", "package-lock.json"] if f in items]
-        js_percentage = ((file_counts.get('.js', 0) + file_counts.get('.ts', 0) + file_counts.get('.jsx', 0) + file_counts.get('.tsx', 0)) / total_files) * 100
-        
-        # Java indicators
-        java_files = [f for f in ["pom.xml", "build.gradle", "build.gradle.kts"] if f in items]
-        java_percentage = (file_counts.get('.java', 0) / total_files) * 100
-        
-        # Go indicators
-        go_files = [f for f in ["go.mod", "go.sum"] if f in items]
-        go_percentage = (file_counts.get('.go', 0) / total_files) * 100
-        
-        # C# indicators
-        csharp_files = [f for f in items if f.endswith('.csproj') or f.endswith('.sln')]
-        csharp_percentage = (file_counts.get('.cs', 0) / total_files) * 100
-        
-        # PHP indicators
-        php_files = [f for f in ["composer.json", "composer.lock"] if f in items]
-        php_percentage = (file_counts.get('.php', 0) / total_files) * 100
-        
-        # Determine project type with confidence
+
+        # Marker files in the root, by set intersection
+        indicators = {pt: len(names & top_items) for pt, names in PROJECT_INDICATOR_FILES.items()}
+        indicators["csharp"] = sum(1 for name in top_items if _file_ext(name) in CSHARP_INDICATOR_EXTS)
+
+        # Determine project type with confidence: 30 points per marker file,
+        # plus the share of files written in the type's language
         scores = {
-            "python": (len(python_files) * 30 + python_percentage),
-            "nodejs": (len(nodejs_files) * 30 + js_percentage),
-            "java": (len(java_files) * 30 + java_percentage),
-            "go": (len(go_files) * 30 + go_percentage),
-            "csharp": (len(csharp_files) * 30 + csharp_percentage),
-            "php": (len(php_files) * 30 + php_percentage)
+            pt: indicators.get(pt, 0) * 30 + sum(file_counts.get(ext, 0) for ext in extensions) / total_files * 100
+            for pt, extensions in PROJECT_SOURCE_EXTENSIONS.items()
         }
         
         if max(scores.values()) > 0:
@@ -293,10 +325,17 @@ def detect_project_type_advanced(folder_path):
             return detected_type, confidence
         
     except Exception as e:
-        logging.error(_(f"Error detecting project type: {e}"))
+        logging.error(_("Error detecting project type: %s"), e)
     
     return "generic", 0
 
+# Comment and blank-line patterns for minify_content, compiled once at import
+# Line and block comments in one alternation, so C-style sources are scanned once
+C_COMMENT_RE = re.compile(r'//[^\n]*|/\*.*?\*/', re.DOTALL)
+C_BLOCK_COMMENT_RE = re.compile(r'/\*.*?\*/', re.DOTALL)
+MARKUP_COMMENT_RE = re.compile(r'<!--.*?-->', re.DOTALL)
+BLANK_LINES_RE = re.compile(r'\n\s*\n')
+
 def minify_content(content, file_ext):
     """Minify file content to reduce size."""
     if not content:
@@ -320,21 +359,19 @@ def minify_content(content, file_ext):
         content = '\n'.join(minified_lines)
     
     elif file_ext in ['.js', '.ts', '.jsx', '.tsx', '.java', '.cs', '.go', '.php']:
-        # Remove single line comments
-        content = re.sub(r'//.*?$', '', content, flags=re.MULTILINE)
-        # Remove multi-line comments
-        content = re.sub(r'/\*.*?\*/', '', content, flags=re.DOTALL)
+        # Remove single and multi-line comments
+        content = C_COMMENT_RE.sub('', content)
     
     elif file_ext in ['.html', '.xml']:
         # Remove HTML/XML comments
-        content = re.sub(r'<!--.*?-->', '', content, flags=re.DOTALL)
+        content = MARKUP_COMMENT_RE.sub('', content)
     
     elif file_ext in ['.css', '.scss']:
         # Remove CSS comments
-        content = re.sub(r'/\*.*?\*/', '', content, flags=re.DOTALL)
+        content = C_BLOCK_COMMENT_RE.sub('', content)
     
     # Remove excessive whitespace
-    content = re.sub(r'\n\s*\n', '\n\n', content)
+    content = BLANK_LINES_RE.sub('\n\n', content)
     
     return content
 
@@ -343,196 +380,695 @@ def clone_remote_repo(remote_url, temp_dir="temp_repo"):
     if os.path.exists(temp_dir):
         shutil.rmtree(temp_dir)
     try:
-        logging.info(_(f"Cloning repository: {remote_url}"))
+        logging.info(_("Cloning repository: %s"), remote_url)
+        import git  # GitPython takes ~150 ms to import; only --remote needs it
         git.Repo.clone_from(remote_url, temp_dir)
         return temp_dir
     except Exception as e:
-        logging.error(_(f"Failed to clone repository: {e}"))
+        logging.error(_("Failed to clone repository: %s"), e)
         raise
 
+# Formats that are always binary; files with these extensions are skipped without being opened.
+# Extensions that are sometimes text (.map, .obj, .svg, .dat) are left to the byte sniff.
+BINARY_EXTENSIONS = frozenset({
+    '.png', '.jpg', '.jpeg', '.gif', '.bmp', '.ico', '.webp', '.pdf',
+    '.zip', '.tar', '.gz', '.7z', '.rar', '.jar', '.whl',
+    '.exe', '.dll', '.so', '.dylib', '.o', '.class', '.pyc', '.pyo', '.pyd', '.wasm',
+    '.mp3', '.mp4', '.mov', '.avi', '.woff', '.woff2', '.ttf', '.otf',
+})
+
+# UTF-16 text is the one text encoding whose bytes contain NULs and don't hold ASCII as-is
+UTF16_BOMS = (b'\xff\xfe', b'\xfe\xff')
+
+# Bytes that occur in text files: printable ASCII, common control characters, and everything
+# above 0x7F (UTF-8 sequences and legacy single-byte codepages)
+_TEXT_BYTES = bytes({7, 8, 9, 10, 12, 13, 27} | set(range(0x20, 0x100)) - {0x7F})
+
+def _looks_binary(sample):
+    """Check if the leading bytes of a file look binary."""
+    # UTF-16 text legitimately contains NUL bytes; its BOM tells it apart
+    if sample[:2] in UTF16_BOMS:
+        return False
+    if b'\x00' in sample:
+        return True
+    # Valid UTF-8 is text
+    try:
+        sample.decode('utf-8')
+        return False
+    except UnicodeDecodeError as e:
+        # A multi-byte character cut off at the end of the sample is still UTF-8
+        if e.reason == 'unexpected end of data':
+            return False
+    # Legacy-encoded text is mostly printable; binary data is full of control bytes
+    control_bytes = sample.translate(None, _TEXT_BYTES)
+    return len(control_bytes) > len(sample) * 0.3
+
+def _open_for_read(file_path):
+    """os.open a file read-only, skipping the access-time update where the OS permits it."""
+    flags = os.O_RDONLY | getattr(os, "O_BINARY", 0)
+    noatime = getattr(os, "O_NOATIME", 0)
+    if noatime:
+        try:
+            return os.open(file_path, flags | noatime)
+        except PermissionError:
+            # Linux only allows O_NOATIME on files the caller owns
+            pass
+    return os.open(file_path, flags)
+
 def is_binary_file(file_path):
-    """Check if a file is binary."""
+    """Check if a file is binary (standalone helper; read_file sniffs the bytes it already read)."""
+    if _file_ext(os.path.basename(file_path)) in BINARY_EXTENSIONS:
+        return True
     try:
-        with open(file_path, "rb") as f:
-            content = f.read(1024)
-            result = chardet.detect(content)
-            return result["confidence"] < 0.9 or result["encoding"] is None
+        fd = _open_for_read(file_path)
+        try:
+            return _looks_binary(os.read(fd, BINARY_SNIFF_BYTES))
+        finally:
+            os.close(fd)
     except Exception:
         return True
 
+# Compiled once at import; check_sensitive_content runs on every file
+SENSITIVE_PATTERNS = tuple(re.compile(pattern, re.IGNORECASE) for pattern in (
+    r"API_KEY\s*=\s*['\"][A-Za-z0-9_-]+['\"]",
+    r"SECRET_KEY\s*=\s*['\"][A-Za-z0-9_-]+['\"]",
+    r"password\s*=\s*['\"][^'\"]+['\"]",
+    r"token\s*=\s*['\"][A-Za-z0-9_-]+['\"]"
+))
+# Literal each pattern needs; files without any of them skip the regex scans entirely
+SENSITIVE_SENTINELS = ("api_key", "secret_key", "password", "token")
+
+# Replaces the whole content of a file that check_sensitive_content flags
+MASKED_CONTENT = "[MASKED SENSITIVE CONTENT]"
+
+def _warn_sensitive(file_path):
+    """Tell the user a file's content was masked."""
+    print(f"{Fore.YELLOW}⚠ Warning: Sensitive content detected in {file_path}. Masking...{Style.RESET_ALL}")
+
 def check_sensitive_content(content):
     """Check for sensitive content like API keys."""
-    sensitive_patterns = [
-        r"API_KEY\s*=\s*['\"][A-Za-z0-9_-]+['\"]",
-        r"SECRET_KEY\s*=\s*['\"][A-Za-z0-9_-]+['\"]",
-        r"password\s*=\s*['\"][^'\"]+['\"]",
-        r"token\s*=\s*['\"][A-Za-z0-9_-]+['\"]"
-    ]
-    for pattern in sensitive_patterns:
-        if re.search(pattern, content, re.IGNORECASE):
-            logging.warning(_(f"Potential sensitive content detected in file"))
+    folded = content.casefold()
+    if not any(sentinel in folded for sentinel in SENSITIVE_SENTINELS):
+        return False
+    for pattern in SENSITIVE_PATTERNS:
+        if pattern.search(content):
+            logging.warning(_("Potential sensitive content detected in file"))
             return True
     return False
 
-def get_structure(folder_path, indent=0, filter_folder=None, exclude_folders=None, exclude_extensions=None):
-    """Get folder structure with size information."""
+def _file_ext(name):
+    """Return the lower-cased extension of a file name, like os.path.splitext without path parsing."""
+    head, _dot, ext = name.rpartition('.')
+    # Leading dots (".gitignore", "..x") are part of the name, not an extension
+    if not head.strip('.'):
+        return ''
+    return '.' + ext.lower()
+
+def _exclude_sets(exclude_folders=None, exclude_extensions=None):
+    """Apply the default exclusions and return them as frozensets for O(1) lookups."""
     if exclude_folders is None:
         exclude_folders = ['.git']
     if exclude_extensions is None:
         exclude_extensions = ['.svg', '.jpg', '.png', '.bin']
+    # Extensions are compared against the lowercased suffix from _file_ext
+    return frozenset(exclude_folders), frozenset(e.lower() for e in exclude_extensions)
+
+def _iter_files(folder_path, exclude_folders, filter_folder=None, listings=None):
+    """Yield (dirpath, entry) for every regular file, skipping excluded folders and symlinks.
+
+    With filter_folder, only files inside a folder of exactly that name are yielded.
+    """
+    # Each stack item carries whether it already sits under a filter_folder component
+    stack = [(folder_path, not filter_folder)]
+    while stack:
+        dirpath, under_filter = stack.pop()
+        # Reuse (and release) a listing already scanned by get_structure
+        entries = listings.pop(dirpath, None) if listings is not None else None
+        if entries is None:
+            try:
+                with os.scandir(dirpath) as it:
+                    entries = list(it)
+            except OSError as e:
+                logging.warning(_("Could not list directory %s: %s"), dirpath, e)
+                continue
+
+        # Folders outside the filter are still descended, since a match may be nested deeper
+        subdirs = []
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                if entry.name not in exclude_folders:
+                    subdirs.append((entry.path, under_filter or entry.name == filter_folder))
+            elif under_filter and entry.is_file(follow_symlinks=False):
+                yield dirpath, entry
+        stack.extend(reversed(subdirs))
+
+def _scan_dir(folder_path, listings=None):
+    """List a directory with os.scandir, returning (entries, error_line)."""
+    if listings is not None:
+        entries = listings.get(folder_path)
+        if entries is not None:
+            return entries, None
+    try:
+        with os.scandir(folder_path) as it:
+            entries = list(it)
+        if listings is not None:
+            listings[folder_path] = entries
+        return entries, None
+    except Exception as e:
+        logging.error(_("Could not list directory %s: %s"), folder_path, e)
+        return [], f"[ERROR] Could not list directory {folder_path}: {e}\n"
+
+def _folder_sizes(folder_path, exclude_folders, listings):
+    """Return {folder path: total file size} for every folder under folder_path, listing each once."""
+    # Pre-order listing pass; every listing is kept for the walks that follow
+    order = []
+    stack = [folder_path]
+    while stack:
+        path = stack.pop()
+        order.append(path)
+        entries = listings.get(path)
+        if entries is None:
+            try:
+                with os.scandir(path) as it:
+                    entries = list(it)
+            except OSError:
+                # Left uncached so the structure walk reports the error itself
+                continue
+            listings[path] = entries
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False) and entry.name not in exclude_folders:
+                stack.append(entry.path)
+
+    # Reversed pre-order visits every folder after all of its subfolders, so each total is a sum
+    sizes = {}
+    for path in reversed(order):
+        total = 0
+        for entry in listings.get(path, ()):
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    total += sizes.get(entry.path, 0)
+                elif entry.is_file(follow_symlinks=False):
+                    total += entry.stat(follow_symlinks=False).st_size
+            except OSError:
+                # Vanished mid-walk; it just doesn't count
+                pass
+        sizes[path] = total
+    return sizes
+
+def _walk_structure(folder_path, indent, filter_folder, exclude_folders, exclude_extensions, listings=None):
+    """Yield folder structure lines for folder_path and its subfolders."""
+    if listings is None:
+        listings = {}
+    # Every folder's size up front in one pass, rather than re-walking each subtree per [DIR] line
+    sizes = _folder_sizes(folder_path, exclude_folders, listings)
+
+    # filter_folder matches whole folder names, as in the contents walk: list the folders named
+    # filter_folder, everything inside them, and the folders on the way down to them
+    on_path = set()
+    if filter_folder:
+        root_len = len(folder_path)
+        for path in sizes:
+            if os.path.basename(path) == filter_folder:
+                while len(path) > root_len and path not in on_path:
+                    on_path.add(path)
+                    path = os.path.dirname(path)
+
+    entries, error = _scan_dir(folder_path, listings)
+    if error:
+        yield error
+        return
+
+    # Explicit stack of per-directory iterators instead of recursion; branch prefixes built once per depth
+    stack = [(iter(enumerate(entries)), len(entries), indent // 4, not filter_folder)]
+    prefixes = []
+    while stack:
+        items, count, depth, under_filter = stack[-1]
+        while len(prefixes) <= depth:
+            indent_str = '    ' * len(prefixes)
+            prefixes.append((indent_str + '├── ', indent_str + '└── '))
+        middle, last = prefixes[depth]
+
+        for index, entry in items:
+            item = entry.name
+            # Symlinks are skipped so the walk never leaves the tree or stats through links
+            if item in exclude_folders or entry.is_symlink():
+                continue
+
+            prefix = last if index == count - 1 else middle
+
+            if entry.is_dir(follow_symlinks=False):
+                if not under_filter and entry.path not in on_path:
+                    continue
+
+                size = sizes.get(entry.path, 0)
+                yield f'{prefix}[DIR] {item} ({format_size(size)})\n'
+
+                sub_entries, error = _scan_dir(entry.path, listings)
+                if error:
+                    yield error
+                    continue
+                # Descend; this level's iterator resumes once the subfolder is done
+                stack.append((iter(enumerate(sub_entries)), len(sub_entries), depth + 1,
+                              under_filter or item == filter_folder))
+                break
+            else:
+                file_ext = _file_ext(item)
+                if file_ext in exclude_extensions:
+                    continue
+
+                size = entry.stat().st_size
+                yield f'{prefix}[FILE] {item} ({format_size(size)})\n'
+        else:
+            stack.pop()
+
+def get_structure(folder_path, indent=0, filter_folder=None, exclude_folders=None, exclude_extensions=None,
+                  listings=None):
+    """Get folder structure with size information."""
+    exclude_folders, exclude_extensions = _exclude_sets(exclude_folders, exclude_extensions)
 
-    structure = ""
     try:
         folder_path = validate_path(folder_path)
-        items = os.listdir(folder_path)
     except Exception as e:
-        logging.error(_(f"Could not list directory {folder_path}: {e}"))
+        logging.error(_("Could not list directory %s: %s"), folder_path, e)
         return f"[ERROR] Could not list directory {folder_path}: {e}\n"
 
-    for index, item in enumerate(items):
-        if item in exclude_folders:
-            continue
+    return "".join(_walk_structure(folder_path, indent, filter_folder, exclude_folders, exclude_extensions, listings))
 
-        item_path = os.path.join(folder_path, item)
-        is_last = index == len(items) - 1
+@functools.lru_cache(maxsize=16)
+def _compile_filters(keyword=None, regex=None):
+    """Compile keyword/regex filters once into (bytes_matchers, text_matchers) predicate tuples."""
+    # Plain ASCII keywords match raw bytes so rejected files are never decoded; everything else
+    # matches decoded text. Both filters must match, so they stay separate predicates (cheapest
+    # first) rather than a union. Bytes matchers also accept str, for files read_file must decode
+    # before matching (UTF-16).
+    bytes_matchers, text_matchers = [], []
 
-        if os.path.isdir(item_path):
-            if filter_folder and filter_folder not in item:
-                continue
+    if keyword:
+        if keyword.isascii():
+            keyword_bytes = keyword.lower().encode()
+            search_bytes = re.compile(re.escape(keyword_bytes), re.IGNORECASE).search
+            search_text = re.compile(re.escape(keyword), re.IGNORECASE).search
 
-            size = get_folder_size(item_path)
-            structure += '    ' * (indent // 4)
-            structure += '└── ' if is_last else '├── '
-            structure += f'[DIR] {item} ({format_size(size)})\n'
+            def match_keyword(data):
+                # bytes.lower() is ASCII-only and several times faster than an IGNORECASE regex;
+                # mmaps have no lower(), so large files keep the copy-free regex scan
+                if isinstance(data, bytes):
+                    return keyword_bytes in data.lower()
+                if isinstance(data, str):
+                    return search_text(data) is not None
+                return search_bytes(data) is not None
 
-            structure += get_structure(item_path, indent + 4, filter_folder, exclude_folders, exclude_extensions)
+            bytes_matchers.append(match_keyword)
         else:
-            file_ext = os.path.splitext(item)[1].lower()
-            if file_ext in exclude_extensions:
-                continue
+            # A compiled case-insensitive literal skips the lowercased copy of every decoded file
+            text_matchers.append(re.compile(re.escape(keyword), re.IGNORECASE).search)
 
-            size = os.path.getsize(item_path)
-            structure += '    ' * (indent // 4)
-            structure += ('└── ' if is_last else '├── ') + f'[FILE] {item} ({format_size(size)})\n'
+    pattern = None
+    if isinstance(regex, re.Pattern):
+        # Precompiled by the caller; its own flags apply
+        pattern = regex
+    elif regex:
+        if '.*.*' in regex:
+            logging.warning(_("Regex contains '.*.*', which backtracks heavily on large files; one '.*' matches the same text"))
+        try:
+            # A str pattern on decoded text: \d, \w, \b and . must keep matching non-ASCII text
+            pattern = re.compile(regex, re.IGNORECASE)
+        except re.error as e:
+            raise ValueError(_("Invalid regex pattern: %s") % e)
 
-    return structure
+    if pattern is not None:
+        matchers = bytes_matchers if isinstance(pattern.pattern, bytes) else text_matchers
+        matchers.append(pattern.search)
 
-def read_file(file_path, keyword=None, regex=None, minify=False):
+    return tuple(bytes_matchers), tuple(text_matchers)
+
+def _read_fd(fd, size):
+    """Read an open file to EOF; sized from stat, a regular file takes a single read() call."""
+    # Asking for one byte more than expected confirms EOF in the same call
+    data = os.read(fd, size + 1)
+    if len(data) == size:
+        return data
+    # Short read, or the file grew since it was stat'ed: read the rest in blocks
+    chunks = [data]
+    while True:
+        chunk = os.read(fd, 1 << 16)
+        if not chunk:
+            break
+        chunks.append(chunk)
+    return b"".join(chunks)
+
+def read_file(file_path, keyword=None, regex=None, minify=False, filters=None):
     """Read file content with encoding detection and optional minification."""
-    if is_binary_file(file_path):
-        logging.info(_(f"Skipping binary file: {file_path}"))
-        return None
+    if filters is None:
+        filters = _compile_filters(keyword, regex)
 
+    bytes_matchers, text_matchers = filters
     try:
-        with open(file_path, "rb") as f:
-            raw_data = f.read()
-            result = chardet.detect(raw_data)
+        # Reject non-matching files before paying for encoding detection and decode
+        fd = _open_for_read(file_path)
+        try:
+            size = os.fstat(fd).st_size
+            if size > MMAP_THRESHOLD:
+                # Sniff and scan large files through the page cache; only read them in if they pass
+                with mmap.mmap(fd, 0, access=mmap.ACCESS_READ) as mapped:
+                    if hasattr(mmap, "MADV_SEQUENTIAL"):
+                        # The scan is front to back; let the kernel read ahead aggressively
+                        mapped.madvise(mmap.MADV_SEQUENTIAL)
+                    if _looks_binary(mapped[:BINARY_SNIFF_BYTES]):
+                        logging.info(_("Skipping binary file: %s"), file_path)
+                        return None
+                    utf16 = mapped[:2] in UTF16_BOMS
+                    if not utf16 and not all(match(mapped) for match in bytes_matchers):
+                        return None
+                raw_data = _read_fd(fd, size)
+            else:
+                raw_data = _read_fd(fd, size)
+                utf16 = raw_data[:2] in UTF16_BOMS
+                if not utf16 and not all(match(raw_data) for match in bytes_matchers):
+                    return None
+                # Sniff the bytes already in memory instead of opening the file a second time
+                if _looks_binary(raw_data[:BINARY_SNIFF_BYTES]):
+                    logging.info(_("Skipping binary file: %s"), file_path)
+                    return None
+        finally:
+            os.close(fd)
+
+        if not raw_data:
+            return None
+
+        try:
+            content = raw_data.decode("utf-8")
+        except UnicodeDecodeError:
+            # Not UTF-8: fall back to chardet, on the sniffed prefix rather than the whole file
+            import chardet  # Imported on first use; most trees are all UTF-8
+            result = chardet.detect(raw_data[:BINARY_SNIFF_BYTES])
             encoding = result["encoding"] if result["encoding"] else "utf-8"
             content = raw_data.decode(encoding, errors="replace")
+
+        # UTF-16 bytes can't be matched raw, so those files run every filter on the decoded text
+        deferred = bytes_matchers if utf16 else ()
+        if not all(match(content) for match in (*deferred, *text_matchers)):
+            return None
         
         if check_sensitive_content(content):
-            print(f"{Fore.YELLOW}⚠ Warning: Sensitive content detected in {file_path}. Masking...{Style.RESET_ALL}")
-            content = "[MASKED SENSITIVE CONTENT]"
+            _warn_sensitive(file_path)
+            content = MASKED_CONTENT
 
         # Apply minification if enabled
-        if minify and content != "[MASKED SENSITIVE CONTENT]":
-            file_ext = os.path.splitext(file_path)[1].lower()
+        if minify and content != MASKED_CONTENT:
+            file_ext = _file_ext(os.path.basename(file_path))
             content = minify_content(content, file_ext)
-
-        if keyword and keyword.lower() not in content.lower():
-            return None
-        if regex and not re.search(regex, content, re.IGNORECASE):
-            return None
         
         return f"\n{'-' * 40}\nFile: {file_path}\n{'-' * 40}\n{content}\n"
     except Exception as e:
-        logging.error(_(f"Could not read {file_path}: {e}"))
+        logging.error(_("Could not read %s: %s"), file_path, e)
         return f"\n[ERROR] Could not read {file_path}: {e}\n"
 
-def get_file_contents(folder_path, filter_folder=None, exclude_folders=None, exclude_extensions=None, 
-                     keyword=None, regex=None, min_size=0, modified_after=None, minify=False, 
-                     selected_files=None):
-    """Get file contents with optional file selection."""
-    if exclude_folders is None:
-        exclude_folders = ['.git']
-    if exclude_extensions is None:
-        exclude_extensions = ['.svg', '.jpg', '.png', '.bin']
+def open_read_cache(cache_path=READ_CACHE_PATH):
+    """Open (creating if needed) the on-disk cache of processed file blocks; None if unavailable."""
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        # Shared by the reader threads, which serialize access through a lock
+        cache = sqlite3.connect(cache_path, check_same_thread=False)
+        cache.execute("PRAGMA journal_mode=WAL")
+        if cache.execute("PRAGMA user_version").fetchone()[0] != READ_CACHE_VERSION:
+            # Written by another version of the tool: its blocks may not match today's output
+            cache.execute("DROP TABLE IF EXISTS reads")
+            cache.execute(f"PRAGMA user_version = {READ_CACHE_VERSION}")
+        cache.execute(
+            "CREATE TABLE IF NOT EXISTS reads ("
+            "path TEXT, signature TEXT, mtime_ns INTEGER, size INTEGER, block TEXT, sensitive INTEGER, "
+            "PRIMARY KEY (path, signature))"
+        )
+        return cache
+    except sqlite3.Error as e:
+        logging.warning(_("Could not open read cache %s: %s"), cache_path, e)
+        return None
 
-    contents = ""
-    file_list = []
-    
+def _read_entry(entry, minify, filters):
+    """read_file() for a DirEntry from the walk."""
+    return read_file(entry.path, minify=minify, filters=filters)
+
+def _read_file_cached(cache, cache_lock, signature, seen, entry, minify, filters):
+    """read_file() backed by the read cache, keyed by path, settings, mtime and size."""
+    file_path = entry.path
     try:
-        folder_path = validate_path(folder_path)
-        for root, dirs, files in os.walk(folder_path):
-            path_parts = os.path.normpath(root).split(os.sep)
-            if any(part in exclude_folders for part in path_parts):
+        # Usually already cached on the DirEntry by the walk's size/date filters
+        st = entry.stat()
+    except OSError:
+        return read_file(file_path, minify=minify, filters=filters)
+
+    with cache_lock:
+        seen.add(file_path)
+        row = cache.execute(
+            "SELECT block, sensitive FROM reads "
+            "WHERE path = ? AND signature = ? AND mtime_ns = ? AND size = ?",
+            (file_path, signature, st.st_mtime_ns, st.st_size)
+        ).fetchone()
+    if row is not None:
+        block, sensitive = row
+        if sensitive:
+            # Masking is cached with the block; the warning has to be repeated on every run
+            logging.warning(_("Potential sensitive content detected in file"))
+            _warn_sensitive(file_path)
+        # A NULL block records a file that was filtered out or skipped as binary
+        return block
+
+    block = read_file(file_path, minify=minify, filters=filters)
+    if block is None or not block.startswith("\n[ERROR]"):
+        sensitive = block is not None and block.endswith(f"\n{MASKED_CONTENT}\n")
+        with cache_lock:
+            # One row per path and settings: a changed file replaces its stale entry
+            cache.execute(
+                "INSERT OR REPLACE INTO reads VALUES (?, ?, ?, ?, ?, ?)",
+                (file_path, signature, st.st_mtime_ns, st.st_size, block, sensitive)
+            )
+    return block
+
+def _prune_read_cache(cache, folder_path, seen):
+    """Drop this root's rows for files that no longer exist."""
+    # Deleted and renamed files never come up again, so their rows would otherwise stay forever.
+    # Files skipped by this run's filters still exist and keep their rows.
+    prefix = os.path.join(folder_path, '')
+    paths = cache.execute(
+        "SELECT DISTINCT path FROM reads WHERE substr(path, 1, ?) = ?", (len(prefix), prefix)
+    ).fetchall()
+    gone = [(path,) for (path,) in paths if path not in seen and not os.path.exists(path)]
+    cache.executemany("DELETE FROM reads WHERE path = ?", gone)
+
+def _iter_candidate_files(folder_path, filter_folder, exclude_folders, exclude_extensions,
+                          min_size, modified_after, selected_files, listings=None):
+    """Yield DirEntry objects for files that pass the name, selection, size and date filters."""
+    # entry.path always starts with this prefix, so relative paths are a plain slice
+    root_prefix_len = len(os.path.join(folder_path, ''))
+    # Compare raw st_mtime floats instead of building a datetime per file
+    modified_after_ts = modified_after.timestamp() if modified_after else None
+    for root, entry in _iter_files(folder_path, exclude_folders, filter_folder, listings):
+        file_ext = _file_ext(entry.name)
+        if file_ext in exclude_extensions:
+            continue
+        if file_ext in BINARY_EXTENSIONS:
+            logging.info(_("Skipping binary file: %s"), entry.path)
+            continue
+        
+        # Check if file is in selected files (if selection is active)
+        if selected_files is not None:
+            if entry.path[root_prefix_len:] not in selected_files:
                 continue
-            if filter_folder and filter_folder not in root:
+
+        # Size/date filters share one cached stat and run before the file is ever opened
+        if min_size > 0 or modified_after:
+            st = entry.stat()
+            if st.st_size < min_size:
                 continue
-            
-            for file in files:
-                file_ext = os.path.splitext(file)[1].lower()
-                if file_ext in exclude_extensions:
-                    continue
-                
-                file_path = os.path.join(root, file)
-                
-                # Check if file is in selected files (if selection is active)
-                if selected_files is not None:
-                    rel_path = os.path.relpath(file_path, folder_path)
-                    if rel_path not in selected_files:
-                        continue
-                
-                if min_size > 0 and os.path.getsize(file_path) < min_size:
-                    continue
-                
-                if modified_after:
-                    file_mtime = datetime.datetime.fromtimestamp(os.path.getmtime(file_path))
-                    if file_mtime < modified_after:
-                        continue
-                
-                file_list.append(file_path)
+            if modified_after_ts is not None and st.st_mtime < modified_after_ts:
+                continue
+
+        yield entry
+
+def _read_batch(read, entries, minify, filters):
+    """Read a batch of files in one worker task, returning their blocks in walk order."""
+    order = range(len(entries))
+    if os.name != "nt":
+        # inode() comes straight from readdir here (Windows would stat); reading in inode
+        # order keeps cold-cache disk access closer to sequential
+        order = sorted(order, key=lambda index: entries[index].inode())
+    blocks = [None] * len(entries)
+    for index in order:
+        blocks[index] = read(entries[index], minify=minify, filters=filters)
+    return blocks
+
+def iter_file_contents(folder_path, filter_folder=None, exclude_folders=None, exclude_extensions=None,
+                       keyword=None, regex=None, min_size=0, modified_after=None, minify=False,
+                       selected_files=None, listings=None, cache=None):
+    """Yield formatted file content blocks one file at a time."""
+    exclude_folders, exclude_extensions = _exclude_sets(exclude_folders, exclude_extensions)
+
+    filters = _compile_filters(keyword, regex)
+    if cache is not None:
+        # Everything besides the file itself that shapes its block
+        pattern = (regex.pattern, regex.flags) if isinstance(regex, re.Pattern) else regex
+        signature = repr((READ_CACHE_VERSION, keyword, pattern, minify))
+        seen = set()
+        read = functools.partial(_read_file_cached, cache, threading.Lock(), signature, seen)
+    else:
+        read = _read_entry
+    from tqdm import tqdm  # Only needed once files are processed; keeps --help fast
+    # Reads are I/O-bound, so use more threads than cores (same cap as the stdlib default)
+    max_workers = min(32, (os.cpu_count() or 1) * 4)
+    max_pending = max_workers * 4
+    pending = deque()
+
+    try:
+        folder_path = validate_path(folder_path)
+        # Reads start as soon as files are discovered, so there is no total for the bar up front
+        with ThreadPoolExecutor(max_workers=max_workers) as executor, \
+                tqdm(desc=_("Processing files"), unit="file", mininterval=0.3, miniters=64) as progress:
+            candidates = _iter_candidate_files(folder_path, filter_folder, exclude_folders,
+                                               exclude_extensions, min_size, modified_after,
+                                               selected_files, listings)
+            # One task per batch of files, not per file, to amortize Future and queue overhead
+            while batch := list(itertools.islice(candidates, READ_BATCH_SIZE)):
+                pending.append(executor.submit(_read_batch, read, batch, minify, filters))
+                # Emit finished batches in discovery order while the walk continues; once enough
+                # batches are queued, wait for the oldest so finished blocks can't pile up in memory
+                while pending and (pending[0].done() or len(pending) > max_pending):
+                    results = pending.popleft().result()
+                    progress.update(len(results))
+                    yield from filter(None, results)
+
+            while pending:
+                results = pending.popleft().result()
+                progress.update(len(results))
+                yield from filter(None, results)
+        if cache is not None:
+            # Only after a walk that ran to completion, so every row it read is marked seen
+            _prune_read_cache(cache, folder_path, seen)
+            cache.commit()
     except Exception as e:
-        logging.error(_(f"Could not process directory {folder_path}: {e}"))
-        return f"[ERROR] Could not process directory {folder_path}: {e}\n"
-
-    with ThreadPoolExecutor(max_workers=4) as executor:
-        results = list(tqdm(
-            executor.map(lambda f: read_file(f, keyword, regex, minify), file_list),
-            total=len(file_list),
-            desc=_("Processing files"),
-            unit="file"
-        ))
-    
-    return "".join([r for r in results if r])
+        logging.error(_("Could not process directory %s: %s"), folder_path, e)
+        yield f"[ERROR] Could not process directory {folder_path}: {e}\n"
+
+def get_file_contents(folder_path, filter_folder=None, exclude_folders=None, exclude_extensions=None, 
+                     keyword=None, regex=None, min_size=0, modified_after=None, minify=False, 
+                     selected_files=None, cache=None):
+    """Get file contents with optional file selection."""
+    return "".join(iter_file_contents(
+        folder_path, filter_folder, exclude_folders, exclude_extensions,
+        keyword, regex, min_size, modified_after, minify, selected_files,
+        cache=cache
+    ))
+
+def build_tree_and_contents(folder_path, filter_folder=None, exclude_folders=None, exclude_extensions=None,
+                            keyword=None, regex=None, min_size=0, modified_after=None, minify=False,
+                            selected_files=None, cache=None):
+    """Return (structure, contents iterator) from a single scan of each directory."""
+    # The structure walk caches every listing it scans; the contents walk consumes them
+    listings = {}
+    structure = get_structure(
+        folder_path,
+        filter_folder=filter_folder,
+        exclude_folders=exclude_folders,
+        exclude_extensions=exclude_extensions,
+        listings=listings
+    )
+    contents = iter_file_contents(
+        folder_path, filter_folder, exclude_folders, exclude_extensions,
+        keyword, regex, min_size, modified_after, minify, selected_files,
+        listings=listings, cache=cache
+    )
+    return structure, contents
+
+# json.dumps(..., ensure_ascii=False) builds a new encoder per call; share one for per-block encoding
+_JSON_ENCODER = json.JSONEncoder(ensure_ascii=False)
+
+def _encode_json_string(text):
+    """Encode a str as a JSON string literal, using orjson when it is installed."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(text).decode()
+        except orjson.JSONEncodeError:
+            # Lone surrogates (e.g. undecodable file names) are only accepted by the stdlib encoder
+            pass
+    return _JSON_ENCODER.encode(text)
+
+def iter_output(structure, contents, output_format="txt", prompt_template=None):
+    """Yield formatted output in chunks; contents may be a string or an iterable of blocks."""
+    if isinstance(contents, str):
+        contents = (contents,)
+
+    if output_format == "json":
+        # Frame the JSON by hand so file contents can be encoded block by block
+        encode = _encode_json_string
+        yield '{\n  "prompt": ' + encode(prompt_template if prompt_template else "")
+        yield ',\n  "folder_structure": ' + encode(structure)
+        yield ',\n  "file_contents": "'
+        for chunk in contents:
+            yield encode(chunk)[1:-1]
+        yield '"\n}'
+        return
+
+    if output_format == "html":
+        # The document is just headings and preformatted blocks, so emit HTML directly rather
+        # than rendering markdown; this also lets file contents stream like the other formats
+        escape = html.escape
+        if prompt_template:
+            yield f"<pre>{escape(prompt_template)}</pre>\n"
+        yield (f"<h1>{escape(_('Project Structure'))}</h1>\n<pre><code>{escape(structure)}\n</code></pre>\n"
+               f"<h1>{escape(_('File Contents'))}</h1>\n<pre><code>")
+        for chunk in contents:
+            yield escape(chunk)
+        yield "\n</code></pre>\n"
+        return
 
-def format_output(structure, contents, output_format="txt", prompt_template=None):
-    """Format output with optional prompt template."""
-    final_output = ""
-    
     # Add prompt template if selected
     if prompt_template:
-        final_output += prompt_template + "\n\n"
-    
-    if output_format == "json":
-        output_dict = {
-            "prompt": prompt_template if prompt_template else "",
-            "folder_structure": structure,
-            "file_contents": contents
-        }
-        return json.dumps(output_dict, indent=2, ensure_ascii=False)
-    elif output_format == "md":
-        output = f"# {_('Project Structure')}\n\n```tree\n{structure}\n```\n\n# {_('File Contents')}\n\n```text\n{contents}\n```"
-        return final_output + output
-    elif output_format == "html":
-        md_content = f"# {_('Project Structure')}\n\n```tree\n{structure}\n```\n\n# {_('File Contents')}\n\n```text\n{contents}\n```"
-        return final_output + markdown2.markdown(md_content)
+        yield prompt_template + "\n\n"
+
+    if output_format == "md":
+        yield f"# {_('Project Structure')}\n\n```tree\n{structure}\n```\n\n# {_('File Contents')}\n\n```text\n"
+        yield from contents
+        yield "\n```"
     else:  # txt
-        output = f"{_('Folder Structure')}:\n{structure}\n\n{_('File Contents')}:{contents}"
-        return final_output + output
+        yield f"{_('Folder Structure')}:\n{structure}\n\n{_('File Contents')}:"
+        yield from contents
+
+def format_output(structure, contents, output_format="txt", prompt_template=None):
+    """Format output with optional prompt template."""
+    return "".join(iter_output(structure, contents, output_format, prompt_template))
+
+def _new_output_path(output_dir, extension):
+    """Claim a fresh timestamped output path without listing the output directory."""
+    stamp = datetime.datetime.now().strftime('%Y%m%d_%H%M%S')
+    filepath = os.path.join(output_dir, f"project_structure_{stamp}.{extension}")
+    suffix = 2
+    # Exclusive create claims the name atomically, so concurrent runs never share a file;
+    # only runs started within the same second need another try
+    while True:
+        try:
+            os.close(os.open(filepath, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+            return filepath
+        except FileExistsError:
+            filepath = os.path.join(output_dir, f"project_structure_{stamp}_{suffix}.{extension}")
+            suffix += 1
+
+def open_with_default_app(filepath):
+    """Open a file with the platform's default application without waiting for it."""
+    if OPEN_COMMAND is None:
+        os.startfile(filepath)
+    else:
+        # No shell: nothing to quote, and the call returns as soon as the opener starts
+        subprocess.Popen(
+            OPEN_COMMAND + [filepath],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            close_fds=True,
+            # Own session: the viewer outlives this process and ignores Ctrl+C in its terminal
+            start_new_session=True
+        )
 
 def save_and_open(output, folder_path, output_format="txt", split_if_large=True, copy_to_clipboard=False):
-    """Save output to file and optionally open it."""
+    """Save output (a string or an iterable of string chunks) to file and optionally open it."""
     try:
         # تغییر مسیر ذخیره‌سازی به پوشه output در مسیر جاری
         output_dir = "output"
@@ -541,49 +1077,54 @@ def save_and_open(output, folder_path, output_format="txt", split_if_large=True,
         extension = {"txt": "txt", "json": "json", "md": "md", "html": "html"}[output_format]
         max_size = 12000
         
+        if isinstance(output, str):
+            output = (output,)
+
+        filepath = _new_output_path(output_dir, extension)
+        
+        written = 0
+        # Blocks arrive one file at a time; a large buffer turns them into few big writes
+        with open(filepath, 'w', encoding='utf-8', buffering=1 << 20) as f:
+            for chunk in output:
+                f.write(chunk)
+                written += len(chunk)
+        
         if copy_to_clipboard:
-            pyperclip.copy(output)
+            import pyperclip  # Only needed with --copy
+            with open(filepath, 'r', encoding='utf-8') as f:
+                pyperclip.copy(f.read())
             logging.info(_("Output copied to clipboard"))
             
-        if split_if_large and len(output) > max_size:
+        if split_if_large and written > max_size:
             print(f"{Fore.YELLOW}⚠️ {_('Output exceeds {max_size:,} characters.').format(max_size=max_size)}{Style.RESET_ALL}")
             user_choice = input(f"{_('Split into multiple files? (y/n):')} ").strip().lower()
             if user_choice == "y":
-                parts = [output[i:i+max_size] for i in range(0, len(output), max_size)]
                 saved_paths = []
-                for idx, part in enumerate(parts, start=1):
-                    filename = f"project_structure_part{idx}.{extension}"
-                    filepath = os.path.join(output_dir, filename)
-                    with open(filepath, 'w', encoding='utf-8') as f:
-                        f.write(part)
-                    saved_paths.append(filepath)
-                logging.info(_(f"Output saved in {len(saved_paths)} files"))
+                stem = os.path.splitext(filepath)[0]
+                with open(filepath, 'r', encoding='utf-8') as src:
+                    for idx, part in enumerate(iter(lambda: src.read(max_size), ''), start=1):
+                        part_path = f"{stem}_part{idx}.{extension}"
+                        with open(part_path, 'w', encoding='utf-8') as f:
+                            f.write(part)
+                        saved_paths.append(part_path)
+                os.remove(filepath)
+                logging.info(_("Output saved in %s files"), len(saved_paths))
                 return saved_paths
-                
-        filename = f"project_structure_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}.{extension}"
-        filepath = os.path.join(output_dir, filename)
-        
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.write(output)
             
         try:
-            if platform.system() == 'Windows':
-                os.startfile(filepath)
-            elif platform.system() == 'Darwin':
-                os.system(f'open "{filepath}"')
-            else:
-                os.system(f'xdg-open "{filepath}"')
+            open_with_default_app(filepath)
         except Exception as e:
-            logging.warning(_(f"Could not open file {filepath}: {e}"))
+            logging.warning(_("Could not open file %s: %s"), filepath, e)
             
         return filepath
         
     except Exception as e:
-        logging.error(_(f"Error saving output: {e}"))
-        raise ValueError(_(f"Error saving output: {e}"))
+        logging.error(_("Error saving output: %s"), e)
+        raise ValueError(_("Error saving output: %s") % e)
     
+@functools.lru_cache(maxsize=8)
 def load_config(project_type="generic"):
-    """Load configuration from config.json."""
+    """Load configuration from config.json (cached; treat the result as read-only)."""
     config_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "config.json")
     default_config = {"projects": PROJECT_DEFAULTS}
     config = default_config.copy()
@@ -594,26 +1135,33 @@ def load_config(project_type="generic"):
                 loaded_config = json.load(f)
                 config.update(loaded_config)
         except Exception as e:
-            logging.warning(_(f"Could not load config.json: {e}"))
+            logging.warning(_("Could not load config.json: %s"), e)
 
     return config["projects"].get(project_type, PROJECT_DEFAULTS["generic"])
 
+# Arrow key codes: the byte after msvcrt's special-key prefix, and the final byte of "ESC [ x"
+WINDOWS_ARROW_KEYS = {
+    b'H': 'UP',      # Up arrow
+    b'P': 'DOWN',    # Down arrow
+    b'K': 'LEFT',    # Left arrow
+    b'M': 'RIGHT',   # Right arrow
+}
+ANSI_ARROW_KEYS = {
+    'A': 'UP',
+    'B': 'DOWN',
+    'C': 'RIGHT',
+    'D': 'LEFT'
+}
+
 def getch():
     """Get a single character from standard input - works on Windows, Linux, and macOS."""
-    if platform.system() == 'Windows':
+    if IS_WINDOWS:
         # Windows handling
         char = msvcrt.getch()
         # Check for special keys (arrows, function keys, etc.)
         if char in (b'\x00', b'\xe0'):  # Special key prefix
             char = msvcrt.getch()  # Get the actual key code
-            # Map Windows arrow key codes
-            key_map = {
-                b'H': 'UP',      # Up arrow
-                b'P': 'DOWN',    # Down arrow
-                b'K': 'LEFT',    # Left arrow
-                b'M': 'RIGHT',   # Right arrow
-            }
-            return key_map.get(char, char.decode('utf-8', errors='ignore'))
+            return WINDOWS_ARROW_KEYS.get(char, char.decode('utf-8', errors='ignore'))
         else:
             try:
                 return char.decode('utf-8', errors='ignore')
@@ -624,7 +1172,7 @@ def getch():
         fd = sys.stdin.fileno()
         old_settings = termios.tcgetattr(fd)
         try:
-            tty.setraw(sys.stdin.fileno())
+            tty.setraw(fd)
             ch = sys.stdin.read(1)
             
             # Check for escape sequences (arrow keys)
@@ -632,18 +1180,37 @@ def getch():
                 ch2 = sys.stdin.read(1)
                 if ch2 == '[':
                     ch3 = sys.stdin.read(1)
-                    # Map Unix arrow key codes
-                    key_map = {
-                        'A': 'UP',
-                        'B': 'DOWN',
-                        'C': 'RIGHT',
-                        'D': 'LEFT'
-                    }
-                    return key_map.get(ch3, ch3)
+                    return ANSI_ARROW_KEYS.get(ch3, ch3)
             return ch
         finally:
             termios.tcsetattr(fd, termios.TCSADRAIN, old_settings)
 
+# ANSI home + erase screen: no clear/cls subprocess per keystroke (colorama translates it on legacy consoles)
+CLEAR_SCREEN = "\x1b[H\x1b[2J"
+
+def clear_screen():
+    """Clear the terminal and move the cursor to the top-left corner."""
+    sys.stdout.write(CLEAR_SCREEN)
+    sys.stdout.flush()
+
+# Color and cursor escapes, which take no columns on screen
+ANSI_ESCAPE_RE = re.compile(r'\x1b\[[0-9;]*[A-Za-z]')
+
+def _display_width(line):
+    """Count the terminal columns a line takes; wide characters such as emoji count as two."""
+    text = ANSI_ESCAPE_RE.sub('', line)
+    return sum(2 if unicodedata.east_asian_width(ch) in 'WF' else 1 for ch in text)
+
+def _fits_screen(lines, size):
+    """Check that lines print one per terminal row, with no wrapping or scrolling."""
+    return len(lines) < size.lines and all(_display_width(line) < size.columns for line in lines)
+
+def _repaint_rows(rows, cursor_row):
+    """Rewrite terminal rows in place ({1-based row: line}), then park the cursor on cursor_row."""
+    sys.stdout.write("".join(f"\x1b[{row};1H{line}\x1b[K" for row, line in rows.items())
+                     + f"\x1b[{cursor_row};1H")
+    sys.stdout.flush()
+
 def select_from_list(items, title="Select an option", multi_select=False):
     """Interactive list selection with arrow keys - works on all platforms."""
     if not items:
@@ -655,38 +1222,44 @@ def select_from_list(items, title="Select an option", multi_select=False):
     # Import colorama for cross-platform colors
     from colorama import init, Fore, Style
     init()
+
+    header = [
+        "",
+        f"{Fore.CYAN}{'=' * 60}{Style.RESET_ALL}",
+        f"{Fore.CYAN}{title}{Style.RESET_ALL}",
+        f"{Fore.YELLOW}Use ↑↓ to navigate, SPACE to select, ENTER to confirm, Q to quit{Style.RESET_ALL}"
+        if multi_select else
+        f"{Fore.YELLOW}Use ↑↓ to navigate, ENTER to select, Q to quit{Style.RESET_ALL}",
+        f"{Fore.CYAN}{'=' * 60}{Style.RESET_ALL}",
+        "",
+    ]
+
+    def render_item(idx):
+        prefix = "> " if idx == current else "  "
+        marker = ("[X] " if idx in selected else "[ ] ") if multi_select else ""
+        if idx == current:
+            return f"{Fore.GREEN}{prefix}{marker}{items[idx]}{Style.RESET_ALL}"
+        if multi_select and idx in selected:
+            return f"{Fore.CYAN}{prefix}{marker}{items[idx]}{Style.RESET_ALL}"
+        return f"{prefix}{marker}{items[idx]}"
+
+    first_row = len(header) + 1
+    # Terminal size of the last full frame, or None if it wrapped or scrolled (see the browser)
+    drawn_for = None
+    redraw = True
     
     while True:
-        # Clear screen
-        os.system('cls' if platform.system() == 'Windows' else 'clear')
-        
-        print(f"\n{Fore.CYAN}{'=' * 60}{Style.RESET_ALL}")
-        print(f"{Fore.CYAN}{title}{Style.RESET_ALL}")
-        if multi_select:
-            print(f"{Fore.YELLOW}Use ↑↓ to navigate, SPACE to select, ENTER to confirm, Q to quit{Style.RESET_ALL}")
-        else:
-            print(f"{Fore.YELLOW}Use ↑↓ to navigate, ENTER to select, Q to quit{Style.RESET_ALL}")
-        print(f"{Fore.CYAN}{'=' * 60}{Style.RESET_ALL}\n")
-        
-        # Display items
-        for idx, item in enumerate(items):
-            prefix = "> " if idx == current else "  "
-            
-            if multi_select:
-                checkbox = "[X]" if idx in selected else "[ ]"
-                marker = f"{checkbox} "
-            else:
-                marker = ""
-            
-            if idx == current:
-                print(f"{Fore.GREEN}{prefix}{marker}{item}{Style.RESET_ALL}")
-            elif multi_select and idx in selected:
-                print(f"{Fore.CYAN}{prefix}{marker}{item}{Style.RESET_ALL}")
-            else:
-                print(f"{prefix}{marker}{item}")
+        if redraw:
+            size = shutil.get_terminal_size()
+            lines = header + [render_item(idx) for idx in range(len(items))]
+            sys.stdout.write(CLEAR_SCREEN + "\n".join(lines) + "\n")
+            sys.stdout.flush()
+            drawn_for = size if _fits_screen(lines, size) else None
+            redraw = False
         
         # Get user input
         key = getch()
+        previous = current
         
         # Handle key presses
         if key == 'UP':
@@ -713,15 +1286,25 @@ def select_from_list(items, title="Select an option", multi_select=False):
             return None
         elif key == '\x1b':  # ESC key
             return None
+        else:
+            # Any other key repaints the whole screen, e.g. after a terminal resize
+            redraw = True
+            continue
+
+        size = shutil.get_terminal_size()
+        changed = {idx: render_item(idx) for idx in {previous, current}}
+        if drawn_for != size or any(_display_width(line) >= size.columns for line in changed.values()):
+            redraw = True
+        else:
+            # Only the rows whose highlight or checkbox changed are rewritten
+            _repaint_rows({first_row + idx: line for idx, line in changed.items()},
+                          first_row + len(items))
 
 def interactive_file_browser(folder_path, exclude_folders=None, exclude_extensions=None):
     """Interactive file browser with selection capability - Fixed for all platforms."""
     from colorama import Fore, Style
     
-    if exclude_folders is None:
-        exclude_folders = ['.git']
-    if exclude_extensions is None:
-        exclude_extensions = ['.svg', '.jpg', '.png', '.bin']
+    exclude_folders, exclude_extensions = _exclude_sets(exclude_folders, exclude_extensions)
     
     # Validate path
     if not os.path.exists(folder_path):
@@ -733,44 +1316,29 @@ def interactive_file_browser(folder_path, exclude_folders=None, exclude_extensio
     
     folder_path = os.path.abspath(folder_path)
     
-    # Build file tree
+    # Build file tree, grouped by directory, from the same scandir walk the readers use
     file_tree = {}
-    all_files = []
     
-    for root, dirs, files in os.walk(folder_path):
-        # Filter directories
-        dirs[:] = [d for d in dirs if d not in exclude_folders]
+    # Every walked path starts with this prefix, so relative paths are plain slices
+    root_prefix_len = len(os.path.join(folder_path, ''))
+    for root, entry in _iter_files(folder_path, exclude_folders):
+        if _file_ext(entry.name) in exclude_extensions:
+            continue
         
-        rel_root = os.path.relpath(root, folder_path)
-        if rel_root == '.':
-            rel_root = '/'
+        rel_root = root[root_prefix_len:] or '/'
+        try:
+            # DirEntry caches its stat; no separate getsize() pass per file
+            size = entry.stat(follow_symlinks=False).st_size
+        except OSError:
+            size = 0
         
-        for file in files:
-            file_ext = os.path.splitext(file)[1].lower()
-            if file_ext in exclude_extensions:
-                continue
-            
-            file_path = os.path.join(root, file)
-            rel_path = os.path.relpath(file_path, folder_path)
-            try:
-                size = os.path.getsize(file_path)
-            except:
-                size = 0
-            
-            all_files.append({
-                'path': rel_path,
-                'full_path': file_path,
-                'name': file,
-                'size': size,
-                'dir': rel_root
-            })
-    
-    # Group by directory
-    for file_info in all_files:
-        dir_name = file_info['dir']
-        if dir_name not in file_tree:
-            file_tree[dir_name] = []
-        file_tree[dir_name].append(file_info)
+        file_tree.setdefault(rel_root, []).append({
+            'path': entry.path[root_prefix_len:],
+            'full_path': entry.path,
+            'name': entry.name,
+            'size': size,
+            'dir': rel_root
+        })
     
     if not file_tree:
         print(f"{Fore.YELLOW}No files found in the specified directory.{Style.RESET_ALL}")
@@ -802,52 +1370,81 @@ def interactive_file_browser(folder_path, exclude_folders=None, exclude_extensio
         else:
             return Fore.GREEN
     
-    while True:
-        # Clear screen
-        os.system('cls' if platform.system() == 'Windows' else 'clear')
-        
-        print(f"\n{Fore.CYAN}{'=' * 80}{Style.RESET_ALL}")
-        print(f"{Fore.CYAN}Interactive File Browser - {folder_path}{Style.RESET_ALL}")
-        print(f"{Fore.YELLOW}Selected: {len(selected_files)} files{Style.RESET_ALL}")
-        print(f"{Fore.YELLOW}Commands: ↑↓=Navigate | →=Enter Dir | ←=Back | SPACE=Select | A=Select All | "
-              f"N=Deselect All | ENTER=Done | Q=Quit{Style.RESET_ALL}")
-        print(f"{Fore.CYAN}{'=' * 80}{Style.RESET_ALL}\n")
-        
+    # Colors looked up once instead of on every row of every frame
+    cyan, green, yellow, reset = Fore.CYAN, Fore.GREEN, Fore.YELLOW, Style.RESET_ALL
+    # A directory's file count and total size never change while browsing
+    dir_summaries = {}
+    for dir_name, files in file_tree.items():
+        total_size = sum(f['size'] for f in files)
+        dir_summaries[dir_name] = (len(files), f"{get_size_color(total_size)}{format_size(total_size)}{reset}")
+    
+    def render_dir(idx):
+        dir_name = dirs[idx]
+        file_count, size_str = dir_summaries[dir_name]
+        prefix = "> " if idx == current_dir else "  "
+        selected_count = sum(1 for f in file_tree[dir_name] if f['path'] in selected_files)
+        status = f"[{selected_count}/{file_count}]" if selected_count > 0 else ""
+        line = f"{prefix}📁 {dir_name} {status} ({file_count} files, {size_str})"
+        return f"{green}{line}" if idx == current_dir else line
+    
+    def render_file(idx):
+        file_info = file_tree[dirs[current_dir]][idx]
+        prefix = "> " if idx == current_file else "  "
+        checkbox = "[X]" if file_info['path'] in selected_files else "[ ]"
+        line = (f"{prefix}{checkbox} 📄 {file_info['name']} "
+                f"({get_size_color(file_info['size'])}{format_size(file_info['size'])}{reset})")
+        if idx == current_file:
+            return f"{green}{line}"
+        if file_info['path'] in selected_files:
+            return f"{cyan}{line}"
+        return line
+    
+    def render_frame():
+        lines = [
+            "",
+            f"{cyan}{'=' * 80}{reset}",
+            f"{cyan}Interactive File Browser - {folder_path}{reset}",
+            f"{yellow}Selected: {len(selected_files)} files{reset}",
+            f"{yellow}Commands: ↑↓=Navigate | →=Enter Dir | ←=Back | SPACE=Select | A=Select All | "
+            f"N=Deselect All | ENTER=Done | Q=Quit{reset}",
+            f"{cyan}{'=' * 80}{reset}",
+            "",
+        ]
         if view_mode == 'dirs':
-            print(f"{Fore.GREEN}Directories:{Style.RESET_ALL}\n")
-            for idx, dir_name in enumerate(dirs):
-                file_count = len(file_tree[dir_name])
-                total_size = sum(f['size'] for f in file_tree[dir_name])
-                size_str = format_size(total_size)
-                size_color = get_size_color(total_size)
-                
-                prefix = "> " if idx == current_dir else "  "
-                selected_count = sum(1 for f in file_tree[dir_name] if f['path'] in selected_files)
-                status = f"[{selected_count}/{file_count}]" if selected_count > 0 else ""
-                
-                if idx == current_dir:
-                    print(f"{Fore.GREEN}{prefix}📁 {dir_name} {status} ({file_count} files, {size_color}{size_str}{Style.RESET_ALL})")
-                else:
-                    print(f"{prefix}📁 {dir_name} {status} ({file_count} files, {size_color}{size_str}{Style.RESET_ALL})")
-        
+            lines += [f"{green}Directories:{reset}", ""]
+            lines += [render_dir(idx) for idx in range(len(dirs))]
         else:  # view_mode == 'files'
-            current_dir_name = dirs[current_dir]
-            files_in_dir = file_tree[current_dir_name]
-            
-            print(f"{Fore.GREEN}Files in: {current_dir_name}{Style.RESET_ALL}\n")
-            for idx, file_info in enumerate(files_in_dir):
-                size_str = format_size(file_info['size'])
-                size_color = get_size_color(file_info['size'])
-                
-                prefix = "> " if idx == current_file else "  "
-                checkbox = "[X]" if file_info['path'] in selected_files else "[ ]"
-                
-                if idx == current_file:
-                    print(f"{Fore.GREEN}{prefix}{checkbox} 📄 {file_info['name']} ({size_color}{size_str}{Style.RESET_ALL})")
-                elif file_info['path'] in selected_files:
-                    print(f"{Fore.CYAN}{prefix}{checkbox} 📄 {file_info['name']} ({size_color}{size_str}{Style.RESET_ALL})")
-                else:
-                    print(f"{prefix}{checkbox} 📄 {file_info['name']} ({size_color}{size_str}{Style.RESET_ALL})")
+            lines += [f"{green}Files in: {dirs[current_dir]}{reset}", ""]
+            lines += [render_file(idx) for idx in range(len(file_tree[dirs[current_dir]]))]
+        return lines
+    
+    # Terminal size of the last full frame, or None if that frame wrapped or scrolled, since
+    # its rows can then no longer be addressed by line number
+    drawn_for = None
+    last_state = None
+    while True:
+        # Redraw only if a key changed something, as one write instead of a print per row
+        state = (view_mode, current_dir, current_file, len(selected_files))
+        if state != last_state:
+            size = shutil.get_terminal_size()
+            moved = None
+            if drawn_for == size and state[0::3] == last_state[0::3]:
+                if view_mode == 'files' and state[1] == last_state[1]:
+                    # Only the file cursor moved: rewrite the old and new highlighted rows
+                    moved = {idx: render_file(idx) for idx in {last_state[2], current_file}}
+                elif view_mode == 'dirs':
+                    # Only the directory cursor moved
+                    moved = {idx: render_dir(idx) for idx in {last_state[1], current_dir}}
+            if moved and not any(_display_width(line) >= size.columns for line in moved.values()):
+                _repaint_rows({list_top + idx: line for idx, line in moved.items()}, list_top + row_count)
+            else:
+                lines = render_frame()
+                row_count = len(dirs) if view_mode == 'dirs' else len(file_tree[dirs[current_dir]])
+                list_top = len(lines) - row_count + 1
+                sys.stdout.write(CLEAR_SCREEN + "\n".join(lines) + "\n")
+                sys.stdout.flush()
+                drawn_for = size if _fits_screen(lines, size) else None
+            last_state = state
         
         # Get user input
         key = getch()
@@ -894,6 +1491,12 @@ def interactive_file_browser(folder_path, exclude_folders=None, exclude_extensio
             return None
 
 
+def build_prompt(prompt_keys):
+    """Combine the selected prompt templates into one prompt string."""
+    if not prompt_keys:
+        return ""
+    return "".join(PROMPT_TEMPLATES[key]['template'] + "\n\n" for key in prompt_keys if key in PROMPT_TEMPLATES)
+
 def select_prompts():
     """Select prompt templates interactively."""
     prompts = list(PROMPT_TEMPLATES.keys())
@@ -938,26 +1541,7 @@ def interactive_mode():
     
     use_file_browser = (mode_choice == modes[1])
     
-    # Step 2: Project type selection
-    project_types = list(PROJECT_DEFAULTS.keys())
-    suggested_type, confidence = detect_project_type_advanced(os.getcwd())
-    
-    type_options = []
-    for pt in project_types:
-        color = PROJECT_COLORS.get(pt, Fore.WHITE)
-        if pt == suggested_type:
-            type_options.append(f"{color}{pt} (Detected: {confidence:.0f}% confidence){Style.RESET_ALL}")
-        else:
-            type_options.append(f"{color}{pt}{Style.RESET_ALL}")
-    
-    project_type_display = select_from_list(type_options, "Select Project Type:")
-    if project_type_display is None:
-        return None
-    
-    project_type = project_types[type_options.index(project_type_display)]
-    config = load_config(project_type)
-    
-    # Step 3: Folder path
+    # Step 2: Folder path
     print(f"\n{Fore.CYAN}Enter folder path or GitHub URL{Style.RESET_ALL}")
     print(f"{Fore.YELLOW}Default: {os.getcwd()}{Style.RESET_ALL}")
     folder_input = input(f"{Fore.GREEN}> {Style.RESET_ALL}").strip()
@@ -977,6 +1561,25 @@ def interactive_mode():
             print(f"{Fore.RED}{e}{Style.RESET_ALL}")
             return None
     
+    # Step 3: Project type selection, detected on the chosen folder
+    project_types = list(PROJECT_DEFAULTS.keys())
+    suggested_type, confidence = detect_project_type_advanced(folder_path)
+    
+    type_options = []
+    for pt in project_types:
+        color = PROJECT_COLORS.get(pt, Fore.WHITE)
+        if pt == suggested_type:
+            type_options.append(f"{color}{pt} (Detected: {confidence:.0f}% confidence){Style.RESET_ALL}")
+        else:
+            type_options.append(f"{color}{pt}{Style.RESET_ALL}")
+    
+    project_type_display = select_from_list(type_options, "Select Project Type:")
+    if project_type_display is None:
+        return None
+    
+    project_type = project_types[type_options.index(project_type_display)]
+    config = load_config(project_type)
+    
     # Step 4: File browser mode or standard mode
     selected_files = None
     if use_file_browser:
@@ -1034,10 +1637,7 @@ def interactive_mode():
     selected_prompt_keys = select_prompts()
     
     # Build combined prompt
-    combined_prompt = ""
-    if selected_prompt_keys:
-        for key in selected_prompt_keys:
-            combined_prompt += PROMPT_TEMPLATES[key]['template'] + "\n\n"
+    combined_prompt = build_prompt(selected_prompt_keys)
     
     # Step 6: Output format
     formats = ["txt", "json", "md", "html"]
@@ -1087,7 +1687,7 @@ def main():
     )
     parser.add_argument(
         "-F", "--filter",
-        help=_("Only include folders containing this name"),
+        help=_("Only include folders with exactly this name, and their contents"),
         default=None
     )
     parser.add_argument(
@@ -1149,10 +1749,16 @@ def main():
         nargs='+',
         help=_("Add prompt template(s) to output")
     )
+    parser.add_argument(
+        "--cache",
+        action="store_true",
+        help=_("Reuse results for unchanged files from earlier runs (stores file contents in output/.cache)")
+    )
 
     args = parser.parse_args()
 
     setup_logging(args.log_file)
+    cache = open_read_cache() if args.cache else None
 
     try:
         # CLI mode
@@ -1172,6 +1778,7 @@ def main():
             else:
                 exclude_folders = config['exclude_folders']
                 exclude_extensions = config['exclude_extensions']
+            exclude_folders, exclude_extensions = _exclude_sets(exclude_folders, exclude_extensions)
             
             filter_folder = args.filter
             keyword = args.keyword
@@ -1180,22 +1787,13 @@ def main():
             min_size = args.min_size
             modified_after = datetime.datetime.strptime(args.modified_after, "%Y-%m-%d") if args.modified_after else None
             minify = args.minify
+            # Compile filters up front so a bad --regex fails before any output is written
+            _compile_filters(keyword, regex)
             
             # Build prompt template
-            prompt_template = ""
-            if args.prompt:
-                for prompt_key in args.prompt:
-                    if prompt_key in PROMPT_TEMPLATES:
-                        prompt_template += PROMPT_TEMPLATES[prompt_key]['template'] + "\n\n"
+            prompt_template = build_prompt(args.prompt)
             
-            structure = get_structure(
-                folder_path,
-                filter_folder=filter_folder,
-                exclude_folders=exclude_folders,
-                exclude_extensions=exclude_extensions
-            )
-
-            contents = get_file_contents(
+            structure, contents = build_tree_and_contents(
                 folder_path,
                 filter_folder=filter_folder,
                 exclude_folders=exclude_folders,
@@ -1204,10 +1802,11 @@ def main():
                 regex=regex,
                 min_size=min_size,
                 modified_after=modified_after,
-                minify=minify
+                minify=minify,
+                cache=cache
             )
 
-            output = format_output(structure, contents, output_format, prompt_template)
+            output = iter_output(structure, contents, output_format, prompt_template)
             saved_path = save_and_open(output, folder_path, output_format, copy_to_clipboard=args.copy)
             print(f"\n{Fore.GREEN}✅ {_('Output saved to')}: {Fore.BLUE}{saved_path}{Style.RESET_ALL}")
 
@@ -1220,19 +1819,13 @@ def main():
             if result is None:
                 print(f"\n{Fore.YELLOW}Operation cancelled.{Style.RESET_ALL}")
                 return
+            _compile_filters(result['keyword'], result['regex'])
             
             print(f"\n{Fore.CYAN}{'=' * 60}{Style.RESET_ALL}")
             print(f"{Fore.CYAN}Processing project...{Style.RESET_ALL}")
             print(f"{Fore.CYAN}{'=' * 60}{Style.RESET_ALL}\n")
             
-            structure = get_structure(
-                result['folder_path'],
-                filter_folder=result['filter_folder'],
-                exclude_folders=result['exclude_folders'],
-                exclude_extensions=result['exclude_extensions']
-            )
-
-            contents = get_file_contents(
+            structure, contents = build_tree_and_contents(
                 result['folder_path'],
                 filter_folder=result['filter_folder'],
                 exclude_folders=result['exclude_folders'],
@@ -1242,10 +1835,11 @@ def main():
                 min_size=result['min_size'],
                 modified_after=result['modified_after'],
                 minify=result['minify'],
-                selected_files=result.get('selected_files')
+                selected_files=result.get('selected_files'),
+                cache=cache
             )
 
-            output = format_output(structure, contents, result['output_format'], result['prompt_template'])
+            output = iter_output(structure, contents, result['output_format'], result['prompt_template'])
             
             saved_path = save_and_open(
                 output,
@@ -1255,7 +1849,9 @@ def main():
             )
             
             print(f"\n{Fore.GREEN}✅ {_('Output saved to')}: {Fore.BLUE}{saved_path}{Style.RESET_ALL}")
-            print(f"{Fore.GREEN}✅ Total size: {format_size(len(output.encode('utf-8')))}{Style.RESET_ALL}")
+            saved_paths = saved_path if isinstance(saved_path, list) else [saved_path]
+            total_size = sum(os.path.getsize(p) for p in saved_paths)
+            print(f"{Fore.GREEN}✅ Total size: {format_size(total_size)}{Style.RESET_ALL}")
             
     except ValueError as e:
         print(f"\n{Fore.RED}❌ {_('Error')}: {e}{Style.RESET_ALL}")
@@ -1267,6 +1863,9 @@ def main():
         print(f"\n{Fore.RED}❌ {_('Unexpected error')}: {e}{Style.RESET_ALL}")
         logging.exception("Unexpected error occurred")
         exit(1)
+    finally:
+        if cache is not None:
+            cache.close()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -1,7 +1,10 @@
 import pytest
 import os
+import json
+import re
 import datetime
-from main import get_structure, get_file_contents, format_output
+from main import (get_structure, get_file_contents, format_output, build_tree_and_contents, open_read_cache,
+                  minify_content, detect_project_type_advanced)
 
 def test_get_structure(tmp_path):
     subdir = tmp_path / "subdir"
@@ -36,6 +39,36 @@ def test_get_file_contents_regex(tmp_path):
     assert "file1.txt" in contents
     assert "file2.txt" not in contents
 
+def test_get_file_contents_precompiled_regex(tmp_path):
+    (tmp_path / "file1.txt").write_text("import express")
+    (tmp_path / "file2.txt").write_text("require('fs')")
+
+    contents = get_file_contents(str(tmp_path), regex=re.compile(r"require\("))
+    assert "file2.txt" in contents
+    assert "file1.txt" not in contents
+
+def test_get_file_contents_ascii_regex_matches_unicode_text(tmp_path):
+    (tmp_path / "price.txt").write_text("قیمت ۱۲۳۴", encoding="utf-8")
+
+    contents = get_file_contents(str(tmp_path), regex=r"\d{4}")
+    assert "price.txt" in contents
+
+def test_get_file_contents_filters_utf16_files(tmp_path):
+    (tmp_path / "wide.txt").write_text("import os\n", encoding="utf-16")
+
+    assert "wide.txt" in get_file_contents(str(tmp_path), keyword="IMPORT")
+    assert "wide.txt" in get_file_contents(str(tmp_path), regex=r"^import\s")
+
+def test_get_file_contents_keyword_case_and_unicode(tmp_path):
+    (tmp_path / "upper.txt").write_text("IMPORT os")
+    (tmp_path / "fa.txt").write_text("سلام دنیا", encoding="utf-8")
+    (tmp_path / "other.txt").write_text("nothing here")
+
+    assert "upper.txt" in get_file_contents(str(tmp_path), keyword="import")
+    contents = get_file_contents(str(tmp_path), keyword="سلام")
+    assert "fa.txt" in contents
+    assert "other.txt" not in contents
+
 def test_format_output_json():
     structure = "test structure"
     contents = "test contents"
@@ -43,6 +76,13 @@ def test_format_output_json():
     assert '"folder_structure": "test structure"' in output
     assert '"file_contents": "test contents"' in output
 
+def test_format_output_json_streamed_contents():
+    blocks = ['\nFile: a.py\nprint("a")\n', '\nFile: b.txt\nnaïve\n']
+    output = format_output("test structure", iter(blocks), "json")
+    data = json.loads(output)
+    assert data["folder_structure"] == "test structure"
+    assert data["file_contents"] == "".join(blocks)
+
 def test_format_output_html(tmp_path):
     structure = "test structure"
     contents = "test contents"
@@ -60,4 +100,237 @@ def test_file_filters(tmp_path):
     modified_after = datetime.datetime.now()
     contents = get_file_contents(str(tmp_path), modified_after=modified_after)
     assert "file1.txt" not in contents
-    assert "file2.txt" in contents
\ No newline at end of file
+    assert "file2.txt" in contents
+
+def test_get_file_contents_skips_excluded_folders(tmp_path):
+    nested = tmp_path / "src" / "node_modules" / "pkg"
+    nested.mkdir(parents=True)
+    (nested / "index.js").write_text("module.exports = {}")
+    (tmp_path / "src" / "app.js").write_text("console.log('app')")
+
+    contents = get_file_contents(str(tmp_path), exclude_folders=["node_modules"])
+    assert "app.js" in contents
+    assert "index.js" not in contents
+
+def test_get_file_contents_selected_files(tmp_path):
+    (tmp_path / "sub").mkdir()
+    (tmp_path / "sub" / "keep.py").write_text("print('keep')")
+    (tmp_path / "skip.py").write_text("print('skip')")
+
+    contents = get_file_contents(str(tmp_path), selected_files=[os.path.join("sub", "keep.py")])
+    assert "keep.py" in contents
+    assert "skip.py" not in contents
+
+def test_get_file_contents_keeps_walk_order(tmp_path):
+    # Files are read in parallel but must come out in traversal order
+    names = [f"file{i:03d}.txt" for i in range(100)]
+    for name in names:
+        (tmp_path / name).write_text(name)
+
+    contents = get_file_contents(str(tmp_path))
+    expected = [entry.name for entry in os.scandir(tmp_path)]
+    positions = [contents.index(f"File: {tmp_path / name}\n") for name in expected]
+    assert positions == sorted(positions)
+
+def test_build_tree_and_contents_matches_separate_walks(tmp_path):
+    (tmp_path / "src").mkdir()
+    (tmp_path / "src" / "app.py").write_text("print('hi')")
+    (tmp_path / "readme.txt").write_text("readme")
+
+    structure, contents = build_tree_and_contents(str(tmp_path))
+    assert structure == get_structure(str(tmp_path))
+    assert "".join(contents) == get_file_contents(str(tmp_path))
+
+def test_exclude_extensions_case_insensitive(tmp_path):
+    (tmp_path / "image.PNG").write_text("not really an image")
+    (tmp_path / "notes.txt").write_text("notes")
+
+    structure = get_structure(str(tmp_path), exclude_extensions=[".Png"])
+    assert "image.PNG" not in structure
+    assert "notes.txt" in structure
+    assert "image.PNG" not in get_file_contents(str(tmp_path), exclude_extensions=[".PNG"])
+
+def test_get_structure_folder_size_skips_excluded(tmp_path):
+    src = tmp_path / "src"
+    (src / "node_modules").mkdir(parents=True)
+    (src / "node_modules" / "dep.js").write_text("x" * 5000)
+    (src / "app.py").write_text("x" * 10)
+
+    structure = get_structure(str(tmp_path), exclude_folders=["node_modules"])
+    assert "[DIR] src (10.0B)" in structure
+
+def test_get_file_contents_filter_folder_matches_whole_name(tmp_path):
+    for folder in ("src", "srcbackup"):
+        (tmp_path / folder / "nested").mkdir(parents=True)
+        (tmp_path / folder / "nested" / "mod.py").write_text(folder)
+
+    contents = get_file_contents(str(tmp_path), filter_folder="src")
+    assert os.path.join("src", "nested", "mod.py") in contents
+    assert "srcbackup" not in contents
+
+def test_get_structure_filter_folder_matches_contents(tmp_path):
+    for folder in ("src", "srcbackup", os.path.join("lib", "src"), "docs"):
+        (tmp_path / folder).mkdir(parents=True)
+        (tmp_path / folder / "mod.py").write_text("x")
+
+    structure = get_structure(str(tmp_path), filter_folder="src")
+    contents = get_file_contents(str(tmp_path), filter_folder="src")
+    assert "[DIR] srcbackup" not in structure and "srcbackup" not in contents
+    assert "[DIR] docs" not in structure
+    # A nested match is listed along with the folders leading to it
+    assert "[DIR] lib" in structure
+    assert os.path.join("lib", "src", "mod.py") in contents
+
+def test_get_file_contents_warns_on_redundant_wildcards(tmp_path, caplog):
+    (tmp_path / "a.txt").write_text("Uber alles")
+
+    with caplog.at_level("WARNING"):
+        contents = get_file_contents(str(tmp_path), keyword="UBER", regex="ber.*.*les")
+    assert "a.txt" in contents
+    assert "'.*.*'" in caplog.text
+
+def test_get_file_contents_skips_binary_keeps_utf8(tmp_path):
+    (tmp_path / "data.dat").write_bytes(b"header\x00\x01\x02payload")
+    (tmp_path / "short.txt").write_text("Über alles", encoding="utf-8")
+
+    contents = get_file_contents(str(tmp_path))
+    assert "data.dat" not in contents
+    assert "Über alles" in contents
+
+def test_get_file_contents_skips_binary_extensions_unopened(tmp_path):
+    # Known binary formats are skipped by name, even if the bytes would sniff as text
+    (tmp_path / "logo.png").write_text("not really an image")
+    (tmp_path / "app.js.map").write_text('{"version": 3}')
+
+    contents = get_file_contents(str(tmp_path))
+    assert "logo.png" not in contents
+    assert '{"version": 3}' in contents
+
+def test_symlinks_are_skipped(tmp_path):
+    outside = tmp_path / "outside"
+    outside.mkdir()
+    (outside / "secret.txt").write_text("outside the project")
+    project = tmp_path / "project"
+    project.mkdir()
+    (project / "real.txt").write_text("inside")
+    try:
+        os.symlink(outside / "secret.txt", project / "link.txt")
+        os.symlink(outside, project / "linkdir")
+    except (OSError, NotImplementedError):
+        pytest.skip("symlinks not supported")
+
+    structure = get_structure(str(project))
+    contents = get_file_contents(str(project))
+    assert "real.txt" in structure and "real.txt" in contents
+    assert "link" not in structure
+    assert "outside the project" not in contents
+
+def test_get_file_contents_masks_sensitive_content(tmp_path):
+    (tmp_path / "settings.py").write_text("DEBUG = True\napi_key = 'abc123'\n")
+    (tmp_path / "plain.py").write_text("x = 1\n")
+
+    contents = get_file_contents(str(tmp_path))
+    assert "abc123" not in contents
+    assert "[MASKED SENSITIVE CONTENT]" in contents
+    assert "x = 1" in contents
+
+def test_get_file_contents_decodes_legacy_encoding(tmp_path):
+    text = "Café crème brûlée à la française, déjà vu. " * 20
+    (tmp_path / "latin.txt").write_bytes(text.encode("latin-1"))
+
+    assert "Café crème" in get_file_contents(str(tmp_path))
+
+def test_get_file_contents_read_cache(tmp_path):
+    project = tmp_path / "project"
+    project.mkdir()
+    source = project / "app.py"
+    source.write_text("print('v1')")
+    cache = open_read_cache(str(tmp_path / "cache" / "reads.sqlite3"))
+
+    first = get_file_contents(str(project), cache=cache)
+    assert get_file_contents(str(project), cache=cache) == first
+    assert cache.execute("SELECT COUNT(*) FROM reads").fetchone()[0] == 1
+
+    # A changed mtime/size invalidates the cached block
+    source.write_text("print('v2!')")
+    assert "v2!" in get_file_contents(str(project), cache=cache)
+
+    # Rows for files that are gone are pruned at the end of the next run
+    source.unlink()
+    get_file_contents(str(project), cache=cache)
+    assert cache.execute("SELECT COUNT(*) FROM reads").fetchone()[0] == 0
+    cache.close()
+
+def test_read_cache_filtered_run_keeps_other_rows(tmp_path):
+    project = tmp_path / "project"
+    for folder in ("src", "lib"):
+        (project / folder).mkdir(parents=True)
+        (project / folder / "mod.py").write_text(folder)
+    cache = open_read_cache(str(tmp_path / "cache" / "reads.sqlite3"))
+
+    get_file_contents(str(project), cache=cache)
+    get_file_contents(str(project), filter_folder="src", cache=cache)
+    get_file_contents(str(project), selected_files=[os.path.join("lib", "mod.py")], cache=cache)
+    assert cache.execute("SELECT COUNT(*) FROM reads").fetchone()[0] == 2
+    cache.close()
+
+def test_read_cache_repeats_sensitive_warning(tmp_path, capsys):
+    project = tmp_path / "project"
+    project.mkdir()
+    (project / "settings.py").write_text("api_key = 'abc123'\n")
+    cache = open_read_cache(str(tmp_path / "cache" / "reads.sqlite3"))
+
+    get_file_contents(str(project), cache=cache)
+    capsys.readouterr()
+    contents = get_file_contents(str(project), cache=cache)
+    assert "[MASKED SENSITIVE CONTENT]" in contents
+    assert "Sensitive content detected" in capsys.readouterr().out
+    cache.close()
+
+def test_format_output_html_escapes_contents():
+    output = format_output("tree", iter(["<script>alert(1)</script>", " & more"]), "html")
+    assert "<script>" not in output
+    assert "&lt;script&gt;alert(1)&lt;/script&gt; &amp; more" in output
+
+def test_get_structure_nested_folder_sizes(tmp_path):
+    (tmp_path / "a" / "b").mkdir(parents=True)
+    (tmp_path / "a" / "one.txt").write_text("x" * 100)
+    (tmp_path / "a" / "b" / "two.txt").write_text("x" * 50)
+
+    structure = get_structure(str(tmp_path))
+    assert "[DIR] a (150.0B)" in structure
+    assert "[DIR] b (50.0B)" in structure
+
+def test_minify_content_strips_comments():
+    js = "const a = 1; // trailing\n/* block\n comment */\n\n\n\nconst b = 2;\n"
+    assert minify_content(js, ".js") == "const a = 1; \n\nconst b = 2;\n"
+    # A "//" inside a block comment must not cut the block short
+    assert minify_content("a /* see http://x */ b", ".js") == "a  b"
+    assert minify_content("<p>x</p><!-- note -->", ".html") == "<p>x</p>"
+    assert minify_content("# comment\nx = 1\n", ".py") == "x = 1"
+
+def test_detect_project_type_advanced(tmp_path):
+    (tmp_path / "package.json").write_text("{}")
+    (tmp_path / "src").mkdir()
+    (tmp_path / "src" / "index.ts").write_text("export {}")
+    (tmp_path / "node_modules" / "dep").mkdir(parents=True)
+    for i in range(20):
+        (tmp_path / "node_modules" / "dep" / f"m{i}.py").write_text("")
+
+    project_type, confidence = detect_project_type_advanced(str(tmp_path))
+    assert project_type == "nodejs"
+    assert confidence > 30
+
+def test_detect_project_type_skips_only_dependency_folders(tmp_path):
+    (tmp_path / "a.py").write_text("")
+    (tmp_path / "b.py").write_text("")
+    (tmp_path / "bin").mkdir()
+    for i in range(5):
+        (tmp_path / "bin" / f"G{i}.cs").write_text("class G {}")
+    (tmp_path / ".venv").mkdir()
+    for i in range(20):
+        (tmp_path / ".venv" / f"m{i}.js").write_text("")
+
+    # Build output folders are counted like any other; the virtualenv is not
+    project_type, _ = detect_project_type_advanced(str(tmp_path))
+    assert project_type == "csharp"